@@ -4,6 +4,8 @@
 前提:
 - 同じフォルダに「課題3.csv」があり、列構成が「名前,所属,スコア」
 - このスクリプトを /Users/reika/Desktop/課題/ に置いて実行する
+- 引数に score_cube.json のような .json ファイルを指定すると、
+  CSVを読み直さずに score_cube.py の集計キューブから作成する
 """
 
 import csv
@@ -13,6 +15,8 @@ from pathlib import Path
 from matplotlib import pyplot as plt
 from matplotlib import font_manager, rcParams
 
+from score_cube import ScoreCube
+
 
 def set_japanese_font() -> None:
     """Mac向けに日本語フォントを設定します。"""
@@ -78,7 +82,10 @@ def main():
     if not csv_path.is_absolute():
         csv_path = Path(__file__).resolve().parent / csv_path
 
-    departments, averages, max_scores, min_scores = load_department_scores(csv_path)
+    if csv_path.suffix == ".json":
+        departments, averages, max_scores, min_scores = ScoreCube.load(csv_path).department_summary()
+    else:
+        departments, averages, max_scores, min_scores = load_department_scores(csv_path)
 
     plt.figure(figsize=(6, 4))
     bars = plt.bar(departments, averages, color="skyblue")
@@ -1,12 +1,18 @@
 """
 Pie chart for affiliation counts derived from 課題3 image.
 No CSV needed; counts are hard-coded based on the provided table.
+score_cube.json のような .json の集計キューブを引数に指定すると、そこから人数を取得します。
 日本語フォントを指定して、日本語ラベルが正しく表示されるようにします。
 """
 
+import sys
+from pathlib import Path
+
 from matplotlib import pyplot as plt
 from matplotlib import font_manager, rcParams
 
+from score_cube import ScoreCube
+
 # Counts read from the provided 課題3 table image
 counts = {
     "営業": 10,
@@ -45,8 +51,17 @@ def set_japanese_font():
 if __name__ == "__main__":
     set_japanese_font()
 
+    # 集計キューブが指定されていれば、ハードコードした人数の代わりに使う
+    title = "所属ごとの参加者数（課題3画像より）"
+    if len(sys.argv) > 1 and sys.argv[1].endswith(".json"):
+        cube_path = Path(sys.argv[1])
+        if not cube_path.is_absolute():
+            cube_path = Path(__file__).resolve().parent / cube_path
+        counts = ScoreCube.load(cube_path).department_counts()
+        title = "所属ごとの参加者数（集計キューブより）"
+
     plt.figure(figsize=(6, 6))
-    plt.title("所属ごとの参加者数（課題3画像より）")
+    plt.title(title)
     plt.pie(
         counts.values(),
         labels=counts.keys(),
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ランキング索引
+参加者ごとの平均試行回数を順序統計木（treap）で管理し、ゲームを記録するたびに
+O(log n) で更新します。順位・上位何%か・上位k人を全員分を並べ直さずに求められます。
+平均試行回数が少ないほど上位です。
+"""
+
+import random
+
+
+class _Node:
+    """treapのノード（key = (平均試行回数, 参加者名)）"""
+
+    __slots__ = ("key", "priority", "size", "left", "right")
+
+    def __init__(self, key):
+        self.key = key
+        self.priority = random.random()
+        self.size = 1
+        self.left = None
+        self.right = None
+
+
+def _size(node):
+    return node.size if node else 0
+
+
+def _update(node):
+    node.size = 1 + _size(node.left) + _size(node.right)
+
+
+def _split(node, key):
+    """key より小さいノードの木と、key 以上のノードの木に分ける。"""
+    if node is None:
+        return None, None
+    if node.key < key:
+        node.right, right = _split(node.right, key)
+        _update(node)
+        return node, right
+    left, node.left = _split(node.left, key)
+    _update(node)
+    return left, node
+
+
+def _merge(left, right):
+    """left のすべてのキーが right より小さい2つの木をつなぐ。"""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+
+def _insert(node, new):
+    if node is None:
+        return new
+    if new.priority > node.priority:
+        new.left, new.right = _split(node, new.key)
+        _update(new)
+        return new
+    if new.key < node.key:
+        node.left = _insert(node.left, new)
+    else:
+        node.right = _insert(node.right, new)
+    _update(node)
+    return node
+
+
+def _delete(node, key):
+    if node is None:
+        return None
+    if key < node.key:
+        node.left = _delete(node.left, key)
+    elif node.key < key:
+        node.right = _delete(node.right, key)
+    else:
+        return _merge(node.left, node.right)
+    _update(node)
+    return node
+
+
+class LeaderboardIndex:
+    """
+    平均試行回数によるランキング索引
+
+    record() でゲーム結果を1件追加するたびに、その参加者のキーだけを
+    木から外して入れ直すので、更新は O(log n) で済みます。
+    """
+
+    def __init__(self):
+        self._root = None
+        # 参加者名: [プレイ回数, 合計試行回数]
+        self._totals = {}
+
+    def __len__(self):
+        return _size(self._root)
+
+    def __contains__(self, player_name):
+        return player_name in self._totals
+
+    def _key(self, player_name):
+        count, total = self._totals[player_name]
+        return (total / count, player_name)
+
+    def record(self, player_name, attempts):
+        """
+        ゲーム結果を1件記録する関数
+
+        Args:
+            player_name: 参加者名
+            attempts: 試行回数
+        """
+        if player_name in self._totals:
+            self._root = _delete(self._root, self._key(player_name))
+            self._totals[player_name][0] += 1
+            self._totals[player_name][1] += attempts
+        else:
+            self._totals[player_name] = [1, attempts]
+        self._root = _insert(self._root, _Node(self._key(player_name)))
+
+    def _count_less(self, key):
+        """key より小さいキーの個数を数える。"""
+        count = 0
+        node = self._root
+        while node is not None:
+            if node.key < key:
+                count += _size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+    def rank(self, player_name):
+        """
+        参加者の順位を返す関数（平均試行回数が同じ場合は同順位）
+
+        Args:
+            player_name: 参加者名
+
+        Returns:
+            int: 1から始まる順位（記録がない場合はNone）
+        """
+        if player_name not in self._totals:
+            return None
+        average = self._key(player_name)[0]
+        # 参加者名は空でないので (average, "") は同じ平均のどのキーよりも小さい
+        return self._count_less((average, "")) + 1
+
+    def top_percent(self, player_name):
+        """
+        参加者が上位何%にいるかを返す関数
+
+        Returns:
+            float: 上位何%か（記録がない場合はNone）
+        """
+        rank = self.rank(player_name)
+        if rank is None:
+            return None
+        return rank / len(self) * 100
+
+    def top(self, k):
+        """
+        上位k人を返す関数
+
+        Args:
+            k: 人数
+
+        Returns:
+            list: [(参加者名, 平均試行回数), ...] を上位から順に並べたリスト
+        """
+        result = []
+        stack = []
+        node = self._root
+        while (stack or node is not None) and len(result) < k:
+            if node is not None:
+                stack.append(node)
+                node = node.left
+            else:
+                node = stack.pop()
+                average, player_name = node.key
+                result.append((player_name, average))
+                node = node.right
+        return result
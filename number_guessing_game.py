@@ -11,10 +11,15 @@ import csv
 import os
 from datetime import datetime
 
+from leaderboard import LeaderboardIndex
+
 
 # スコア管理用の辞書（参加者名: [試行回数のリスト]）
 scores = {}
 
+# 平均試行回数によるランキング索引（ゲームを記録するたびに更新）
+leaderboard = LeaderboardIndex()
+
 
 def play_game(player_name):
     """
@@ -166,6 +171,28 @@ def save_scoreboard_to_csv(filename=None):
         return None
 
 
+def display_ranking(k=10):
+    """
+    平均試行回数の少ない順に上位k人のランキングを表示する関数
+    
+    Args:
+        k: 表示する人数
+    """
+    print("\n" + "=" * 50)
+    print("ランキング（平均試行回数の少ない順）".center(50))
+    print("=" * 50)
+    if not len(leaderboard):
+        print("まだスコアが記録されていません。")
+        print("=" * 50)
+        return
+    
+    print(f"{'順位':<6} {'参加者名':<20} {'平均試行回数':<18}")
+    print("-" * 50)
+    for player_name, average in leaderboard.top(k):
+        print(f"{leaderboard.rank(player_name):<6} {player_name:<20} {average:<18.2f}")
+    print("=" * 50)
+
+
 def main():
     """メイン関数"""
     print("=" * 50)
@@ -177,10 +204,11 @@ def main():
         print("1. ゲームをプレイ")
         print("2. スコア表を表示")
         print("3. スコア表をCSVファイルに保存")
-        print("4. 終了")
+        print("4. ランキングを表示")
+        print("5. 終了")
         
         try:
-            choice = input("\n選択してください (1-4): ").strip()
+            choice = input("\n選択してください (1-5): ").strip()
             
             if choice == "1":
                 # 参加者名を入力
@@ -197,7 +225,10 @@ def main():
                     if player_name not in scores:
                         scores[player_name] = []
                     scores[player_name].append(attempts)
+                    leaderboard.record(player_name, attempts)
                     print(f"\n{player_name}さんのスコアを記録しました。")
+                    print(f"現在の順位: {leaderboard.rank(player_name)}位 / {len(leaderboard)}人中"
+                          f"（上位{leaderboard.top_percent(player_name):.1f}%）")
                 
             elif choice == "2":
                 display_scoreboard()
@@ -213,11 +244,14 @@ def main():
                     save_scoreboard_to_csv()
                 
             elif choice == "4":
+                display_ranking()
+                
+            elif choice == "5":
                 print("\nゲームを終了します。お疲れ様でした！")
                 break
                 
             else:
-                print("1から4の数字を入力してください。")
+                print("1から5の数字を入力してください。")
                 
         except KeyboardInterrupt:
             print("\n\nゲームを終了します。")
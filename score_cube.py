@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+スコア集計キューブ
+「名前,所属,スコア」形式のCSVを (所属 × スコア区分 × 読み込み日) のセルごとに
+合計・件数・最高点・最低点へ事前集計し、JSONファイルに保存します。
+棒グラフ・ヒストグラム・円グラフはCSVを読み直さずにセルを足し合わせるだけで作れます。
+
+使い方:
+    python3 score_cube.py add 課題3.csv
+    python3 score_cube.py add 課題3_追加分.csv --date 2025-12-20
+    python3 score_cube.py show
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import math
+import os
+import sys
+from datetime import date
+from pathlib import Path
+
+
+# 既定のキューブファイル名
+DEFAULT_CUBE_FILENAME = "score_cube.json"
+
+# スコア区分の幅（10点刻み。90点以上はまとめて1区分）
+BIN_WIDTH = 10
+TOP_BIN = 90
+
+# score_histogram_from_csv.py の区分とキューブのスコア区分の対応
+HISTOGRAM_BINS = [
+    ("90点以上", 90),
+    ("89〜80点", 80),
+    ("79〜70点", 70),
+]
+
+# ロールアップで指定できる軸
+DIMENSIONS = ("dept", "bin", "date")
+
+
+def score_bin(score):
+    """
+    スコアが属する区分の下限を返す関数
+
+    Args:
+        score: スコア
+
+    Returns:
+        int: 区分の下限（0, 10, ..., 90）
+    """
+    return max(0, min(TOP_BIN, int(score // BIN_WIDTH) * BIN_WIDTH))
+
+
+def count_histogram_bins(scores):
+    """
+    スコアのリストを HISTOGRAM_BINS の区分ごとに数える関数（キューブと同じ区分）
+
+    Returns:
+        tuple: (区分ラベルのリスト, 人数のリスト)
+    """
+    positions = {lower: i for i, (_, lower) in enumerate(HISTOGRAM_BINS)}
+    counts = [0] * len(HISTOGRAM_BINS)
+    for s in scores:
+        i = positions.get(score_bin(s))
+        if i is not None:
+            counts[i] += 1
+    return [label for label, _ in HISTOGRAM_BINS], counts
+
+
+def _update_digest(digest, f, length):
+    """ファイル f の現在位置から length バイトを読んで digest に加える。足りなければFalse。"""
+    remaining = length
+    while remaining > 0:
+        chunk = f.read(min(remaining, 1024 * 1024))
+        if not chunk:
+            return False
+        digest.update(chunk)
+        remaining -= len(chunk)
+    return True
+
+
+def _read_complete_lines(f, length, digest):
+    """
+    ファイル f の現在位置から length バイトの範囲で、改行で終わる行だけを返すジェネレータ
+    末尾の改行のない行（書き込み途中の行）は次回の取り込みに回します。
+    返した行は digest に加えます。
+    """
+    remaining = length
+    while remaining > 0:
+        line = f.readline(remaining)
+        if not line.endswith(b"\n"):
+            return
+        remaining -= len(line)
+        digest.update(line)
+        yield line
+
+
+def _changed_file_error(csv_path):
+    return ValueError(f"{csv_path} は取り込み済みの行が変更されています。キューブを作り直してください。")
+
+
+class ScoreCube:
+    """
+    (所属, スコア区分, 読み込み日) をキーに [合計, 件数, 最低点, 最高点] を持つ集計キューブ
+    """
+
+    def __init__(self):
+        self.cells = {}
+        # 取り込み済みファイル:
+        # {絶対パス: [サイズ, 更新時刻, 取り込んだバイト数, 取り込んだ部分のSHA-256]}
+        self.files = {}
+
+    def add(self, dept, score, load_date):
+        """スコアを1件セルに加える。"""
+        key = (dept, score_bin(score), load_date)
+        cell = self.cells.get(key)
+        if cell is None:
+            self.cells[key] = [score, 1, score, score]
+        else:
+            cell[0] += score
+            cell[1] += 1
+            if score < cell[2]:
+                cell[2] = score
+            if score > cell[3]:
+                cell[3] = score
+
+    def add_csv(self, csv_path, load_date=None):
+        """
+        CSVファイルをキューブに取り込む関数
+        同じ内容のファイル（サイズと更新時刻が同じ）は二重に取り込みません。
+        取り込み済みのファイルが更新されていた場合は、取り込み済みの部分が
+        変わっていないことをハッシュで確かめてから、追記された行だけを取り込みます。
+        改行で終わっていない末尾の行は書き込み途中とみなし、次回に取り込みます。
+
+        Args:
+            csv_path: 「名前,所属,スコア」形式のCSVファイル
+            load_date: 読み込み日（YYYY-MM-DD、省略時は今日）
+
+        Returns:
+            int: 取り込んだ行数（変更がなく取り込まなかった場合はNone）
+
+        Raises:
+            ValueError: 取り込み済みの部分が書き換えられている・短くなっている場合
+        """
+        csv_path = Path(csv_path).resolve()
+        stat = os.stat(csv_path)
+        previous = self.files.get(str(csv_path))
+        if previous is not None and previous[:2] == [stat.st_size, stat.st_mtime_ns]:
+            return None
+        offset = previous[2] if previous is not None else 0
+        if stat.st_size < offset:
+            raise _changed_file_error(csv_path)
+        if load_date is None:
+            load_date = date.today().isoformat()
+
+        digest = hashlib.sha256()
+        consumed = offset
+        added = 0
+        with csv_path.open("rb") as raw:
+            # 取り込み済みの部分（先頭 offset バイト）が変わっていないか確かめる
+            if previous is not None:
+                if not _update_digest(digest, raw, offset) or digest.hexdigest() != previous[3]:
+                    raise _changed_file_error(csv_path)
+
+            def decoded_lines():
+                # stat した時点の大きさまでの、改行で終わる行だけを読む
+                nonlocal consumed
+                for line in _read_complete_lines(raw, stat.st_size - offset, digest):
+                    encoding = "utf-8-sig" if consumed == 0 else "utf-8"
+                    consumed += len(line)
+                    yield line.decode(encoding)
+
+            reader = csv.reader(decoded_lines())
+            if offset == 0:
+                next(reader, None)  # ヘッダー行: 名前,所属,スコア
+            for row in reader:
+                if not row or len(row) < 3:
+                    continue
+                try:
+                    score = float(row[2])
+                except ValueError:
+                    continue
+                if not math.isfinite(score):
+                    continue
+                self.add(row[1].strip(), score, load_date)
+                added += 1
+
+        self.files[str(csv_path)] = [stat.st_size, stat.st_mtime_ns, consumed, digest.hexdigest()]
+        return added
+
+    def rollup(self, by=("dept",), **where):
+        """
+        指定した軸以外のセルを足し合わせる関数
+
+        Args:
+            by: 残す軸（"dept", "bin", "date" の組み合わせ）
+            where: 絞り込み条件（例: dept="営業", date="2025-12-12"）
+
+        Returns:
+            dict: {残した軸の値のタプル: [合計, 件数, 最低点, 最高点]}
+        """
+        positions = [DIMENSIONS.index(d) for d in by]
+        filters = [(DIMENSIONS.index(d), v) for d, v in where.items()]
+        result = {}
+        for key, (total, count, low, high) in self.cells.items():
+            if any(key[i] != v for i, v in filters):
+                continue
+            group = tuple(key[i] for i in positions)
+            agg = result.get(group)
+            if agg is None:
+                result[group] = [total, count, low, high]
+            else:
+                agg[0] += total
+                agg[1] += count
+                agg[2] = min(agg[2], low)
+                agg[3] = max(agg[3], high)
+        return result
+
+    def department_summary(self):
+        """
+        所属ごとの平均・最高点・最低点を返す関数
+        affiliation_bar_from_csv.load_department_scores と同じ形で返します。
+        """
+        by_dept = self.rollup(("dept",))
+        departments = sorted(d for (d,) in by_dept)
+        averages = [by_dept[(d,)][0] / by_dept[(d,)][1] for d in departments]
+        max_scores = [by_dept[(d,)][3] for d in departments]
+        min_scores = [by_dept[(d,)][2] for d in departments]
+        return departments, averages, max_scores, min_scores
+
+    def department_counts(self):
+        """所属ごとの人数を {所属: 人数} で返す。"""
+        return {d: agg[1] for (d,), agg in sorted(self.rollup(("dept",)).items())}
+
+    def histogram_counts(self):
+        """
+        score_histogram_from_csv.py の区分ごとの人数を返す関数
+
+        Returns:
+            tuple: (区分ラベルのリスト, 人数のリスト)
+        """
+        by_bin = self.rollup(("bin",))
+        labels = [label for label, _ in HISTOGRAM_BINS]
+        counts = [by_bin.get((lower,), [0, 0])[1] for _, lower in HISTOGRAM_BINS]
+        return labels, counts
+
+    def save(self, cube_path):
+        """キューブをJSONファイルに保存する。"""
+        data = {
+            "files": self.files,
+            "cells": [[*key, *cell] for key, cell in sorted(self.cells.items())],
+        }
+        tmp_path = f"{cube_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, cube_path)
+
+    @classmethod
+    def load(cls, cube_path, missing_ok=False):
+        """
+        JSONファイルからキューブを読み込む。
+
+        Args:
+            cube_path: キューブファイル
+            missing_ok: Trueならファイルがないときに空のキューブを返す
+                        （Falseなら FileNotFoundError）
+        """
+        cube = cls()
+        if missing_ok and not os.path.exists(cube_path):
+            return cube
+        with open(cube_path, encoding="utf-8") as f:
+            data = json.load(f)
+        cube.files = data["files"]
+        for dept, lower, load_date, total, count, low, high in data["cells"]:
+            cube.cells[(dept, lower, load_date)] = [total, count, low, high]
+        return cube
+
+
+def main():
+    parser = argparse.ArgumentParser(description="スコア集計キューブ")
+    parser.add_argument("--cube", default=DEFAULT_CUBE_FILENAME, help="キューブファイル")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    add = sub.add_parser("add", help="CSVファイルをキューブに取り込む")
+    add.add_argument("csv", nargs="+")
+    add.add_argument("--date", help="読み込み日（YYYY-MM-DD、省略時は今日）")
+
+    sub.add_parser("show", help="所属ごとの集計を表示する")
+
+    args = parser.parse_args()
+
+    cube_path = Path(args.cube)
+    if not cube_path.is_absolute():
+        cube_path = Path(__file__).resolve().parent / cube_path
+    try:
+        cube = ScoreCube.load(cube_path, missing_ok=args.command == "add")
+    except FileNotFoundError:
+        print(f"error: キューブファイル '{cube_path}' が見つかりません。先に add で作成してください。")
+        sys.exit(1)
+
+    if args.command == "add":
+        failed = False
+        for csv_name in args.csv:
+            try:
+                added = cube.add_csv(csv_name, args.date)
+            except (OSError, ValueError) as e:
+                print(f"error: {e}")
+                failed = True
+                continue
+            if added is None:
+                print(f"skipped: {csv_name}（取り込み済み）")
+            else:
+                print(f"added: {csv_name} ({added}件)")
+        cube.save(cube_path)
+        print(f"saved: {cube_path}")
+        if failed:
+            sys.exit(1)
+    else:
+        departments, averages, max_scores, min_scores = cube.department_summary()
+        counts = cube.department_counts()
+        for dept, avg, max_s, min_s in zip(departments, averages, max_scores, min_scores):
+            print(f"{dept}: 人数 {counts[dept]}  平均 {avg:.1f}  最高 {max_s:.0f}  最低 {min_s:.0f}")
+        labels, bin_counts = cube.histogram_counts()
+        for label, c in zip(labels, bin_counts):
+            print(f"{label}: {c}人")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,14 +5,21 @@
 - 90点以上
 - 89〜80点
 - 79〜70点
+
+引数に score_cube.json のような .json ファイルを指定すると、
+CSVを読み直さずに score_cube.py の集計キューブから作成する。
 """
 
 import csv
+import math
+import sys
 from pathlib import Path
 
 from matplotlib import pyplot as plt
 from matplotlib import font_manager, rcParams
 
+from score_cube import ScoreCube, count_histogram_bins
+
 
 def set_japanese_font() -> None:
     """Mac向けに日本語フォントを設定します。"""
@@ -48,6 +55,8 @@ def load_scores(csv_path: Path):
                 score = float(row[2])
             except ValueError:
                 continue
+            if not math.isfinite(score):
+                continue
             scores.append(score)
     return scores
 
@@ -56,19 +65,17 @@ def main():
     set_japanese_font()
 
     base_dir = Path(__file__).resolve().parent
-    csv_path = base_dir / "課題3.csv"
-    scores = load_scores(csv_path)
-
-    # 手動で3区分に分ける
-    bins_labels = ["90点以上", "89〜80点", "79〜70点"]
-    counts = [0, 0, 0]
-    for s in scores:
-        if s >= 90:
-            counts[0] += 1
-        elif 80 <= s <= 89:
-            counts[1] += 1
-        elif 70 <= s <= 79:
-            counts[2] += 1
+    if len(sys.argv) > 1 and sys.argv[1].endswith(".json"):
+        cube_path = Path(sys.argv[1])
+        if not cube_path.is_absolute():
+            cube_path = base_dir / cube_path
+        bins_labels, counts = ScoreCube.load(cube_path).histogram_counts()
+    else:
+        csv_path = base_dir / "課題3.csv"
+        scores = load_scores(csv_path)
+
+        # 集計キューブと同じ区分で3区分に分ける
+        bins_labels, counts = count_histogram_bins(scores)
 
     plt.figure(figsize=(6, 4))
     bars = plt.bar(bins_labels, counts, color="lightgreen")
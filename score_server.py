@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+スコア照会サーバー
+「名前,所属,スコア」形式のCSVを一度だけ読み込んでメモリ上に索引を作り、
+スコア表・所属ごとの集計・度数分布をHTTP経由でJSONまたはPNGとして返します。
+
+使い方:
+    python3 score_server.py serve 課題3.csv --port 8000
+    python3 score_server.py bench --url http://127.0.0.1:8000/scoreboard -n 2000 -c 8
+
+エンドポイント:
+- /scoreboard?name=...        参加者ごとの平均点・最低点・最高点
+- /departments?dept=...       所属ごとの平均・最高・最低・人数
+- /histogram?dept=...         スコア区分ごとの人数
+  いずれも format=png を付けるとグラフ画像を返します。
+"""
+
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import threading
+import time
+import urllib.request
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from score_cube import count_histogram_bins
+from scoreboard import calculate_statistics
+
+
+def set_japanese_font():
+    """Mac向けに日本語フォントを設定します（PNGを描くときに一度だけ呼ぶ）。"""
+    from matplotlib import font_manager, rcParams
+
+    candidates = [
+        "Hiragino Sans",
+        "Hiragino Kaku Gothic ProN",
+        "YuGothic",
+        "Yu Gothic",
+        "Osaka",
+    ]
+
+    for name in candidates:
+        try:
+            font = font_manager.FontProperties(family=name)
+            font_manager.findfont(font)
+            rcParams["font.family"] = name
+            rcParams["axes.unicode_minus"] = False
+            return
+        except Exception:
+            continue
+
+
+class ScoreIndex:
+    """
+    CSVの内容を名前・所属ごとに引けるようにしたメモリ上の索引
+    """
+
+    def __init__(self, rows, mtime):
+        self.mtime = mtime
+        self.by_name = defaultdict(list)
+        self.by_dept = defaultdict(list)
+        for name, dept, score in rows:
+            self.by_name[name].append(score)
+            self.by_dept[dept].append(score)
+
+    @classmethod
+    def from_csv(cls, csv_path):
+        """CSVを読み込んで索引を作る。"""
+        mtime = os.stat(csv_path).st_mtime_ns
+        rows = []
+        with open(csv_path, encoding="utf-8-sig", newline="") as f:
+            reader = csv.reader(f)
+            next(reader, None)  # ヘッダー行: 名前,所属,スコア
+            for row in reader:
+                if not row or len(row) < 3:
+                    continue
+                try:
+                    score = float(row[2])
+                except ValueError:
+                    continue
+                if not math.isfinite(score):
+                    continue
+                rows.append((row[0].strip(), row[1].strip(), score))
+        return cls(rows, mtime)
+
+    def scoreboard(self, name=None):
+        """参加者ごとの統計情報を名前順に返す。"""
+        names = [name] if name else sorted(self.by_name)
+        result = []
+        for player_name in names:
+            stats = calculate_statistics(self.by_name.get(player_name, []))
+            if stats:
+                result.append({"name": player_name, **stats})
+        return result
+
+    def departments(self, dept=None):
+        """所属ごとの平均・最高・最低・人数を所属名順に返す。"""
+        depts = [dept] if dept else sorted(self.by_dept)
+        result = []
+        for dept_name in depts:
+            stats = calculate_statistics(self.by_dept.get(dept_name, []))
+            if stats:
+                result.append({"dept": dept_name, **stats})
+        return result
+
+    def histogram(self, dept=None):
+        """スコア区分ごとの人数を返す。"""
+        if dept:
+            scores = self.by_dept.get(dept, [])
+        else:
+            scores = [s for dept_scores in self.by_dept.values() for s in dept_scores]
+        # 集計キューブと同じ区分で数える
+        labels, counts = count_histogram_bins(scores)
+        return {"labels": labels, "counts": counts}
+
+
+class LRUCache:
+    """
+    スレッドセーフな簡易LRUキャッシュ
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class ScoreService:
+    """
+    索引とレスポンスキャッシュを保持し、元のCSVが更新されたら読み込み直す
+    """
+
+    def __init__(self, csv_path, cache_size=256):
+        self.csv_path = Path(csv_path)
+        self.cache = LRUCache(cache_size)
+        self._reload_lock = threading.Lock()
+        self._render_lock = threading.Lock()
+        self._font_ready = False
+        self.index = ScoreIndex.from_csv(self.csv_path)
+
+    def current_index(self):
+        """
+        CSVの更新時刻が変わっていれば索引を作り直し、キャッシュを破棄する。
+        CSVが一時的に読めない（削除中・置き換え中など）ときは直前の索引を使い続ける。
+        """
+        try:
+            mtime = os.stat(self.csv_path).st_mtime_ns
+            if mtime != self.index.mtime:
+                with self._reload_lock:
+                    if mtime != self.index.mtime:
+                        self.index = ScoreIndex.from_csv(self.csv_path)
+                        self.cache.clear()
+        except OSError:
+            pass
+        return self.index
+
+    def handle(self, path, query):
+        """
+        リクエストを処理する関数
+
+        Returns:
+            tuple: (ステータスコード, Content-Type, 本文のバイト列)
+        """
+        index = self.current_index()
+        fmt = query.get("format", "json")
+        key = (index.mtime, path, tuple(sorted(query.items())))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        if path == "/scoreboard":
+            data = index.scoreboard(query.get("name"))
+        elif path == "/departments":
+            data = index.departments(query.get("dept"))
+        elif path == "/histogram":
+            data = index.histogram(query.get("dept"))
+        else:
+            return 404, "application/json", _to_json({"error": "not found"})
+
+        if fmt == "png":
+            response = (200, "image/png", self.render_png(path, data))
+        elif fmt == "json":
+            response = (200, "application/json", _to_json(data))
+        else:
+            return 400, "application/json", _to_json({"error": f"unknown format: {fmt}"})
+
+        self.cache.put(key, response)
+        return response
+
+    def render_png(self, path, data):
+        """集計結果をグラフ画像（PNG）にする。matplotlibはPNGが要求されたときだけ読み込む。"""
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        # matplotlibの描画はスレッドセーフではないので直列化する
+        with self._render_lock:
+            if not self._font_ready:
+                set_japanese_font()
+                self._font_ready = True
+            fig = Figure(figsize=(6, 4))
+            FigureCanvasAgg(fig)
+            ax = fig.add_subplot()
+            if path == "/histogram":
+                ax.bar(data["labels"], data["counts"], color="lightgreen")
+                ax.set_xlabel("スコア区分")
+                ax.set_ylabel("人数")
+            elif path == "/departments":
+                ax.bar([d["dept"] for d in data], [d["average"] for d in data], color="skyblue")
+                ax.set_xlabel("所属")
+                ax.set_ylabel("平均スコア")
+                ax.set_ylim(0, 100)
+            else:
+                ax.bar([d["name"] for d in data], [d["average"] for d in data], color="skyblue")
+                ax.set_xlabel("名前")
+                ax.set_ylabel("平均スコア")
+                ax.tick_params(axis="x", labelrotation=90)
+            fig.tight_layout()
+            buf = io.BytesIO()
+            fig.savefig(buf, format="png", dpi=150)
+        return buf.getvalue()
+
+
+def _to_json(data):
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+class ScoreRequestHandler(BaseHTTPRequestHandler):
+    """GETリクエストを ScoreService に渡すハンドラ"""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            status, content_type, body = self.server.service.handle(url.path, query)
+        except Exception as e:
+            status, content_type, body = 500, "application/json", _to_json({"error": str(e)})
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # 負荷試験時に標準エラーが溢れないようにアクセスログは出さない
+        pass
+
+
+class ThreadPoolHTTPServer(HTTPServer):
+    """
+    接続ごとの処理をスレッドプールで並行に実行するHTTPサーバー
+    """
+
+    def __init__(self, server_address, service, workers=8):
+        super().__init__(server_address, ScoreRequestHandler)
+        self.service = service
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=True)
+
+
+def run_benchmark(url, requests_total, concurrency):
+    """
+    指定URLに並行してリクエストを送り、1秒あたりの処理件数を測定する関数
+
+    Returns:
+        dict: 成功件数・失敗件数・経過秒数・requests/sec
+    """
+    per_worker = [requests_total // concurrency] * concurrency
+    for i in range(requests_total % concurrency):
+        per_worker[i] += 1
+    ok = [0] * concurrency
+    failed = [0] * concurrency
+
+    def worker(i):
+        for _ in range(per_worker[i]):
+            try:
+                with urllib.request.urlopen(url) as res:
+                    res.read()
+                ok[i] += 1
+            except Exception:
+                failed[i] += 1
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return {
+        "ok": sum(ok),
+        "failed": sum(failed),
+        "elapsed": elapsed,
+        "rps": sum(ok) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="スコア照会サーバー")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="サーバーを起動する")
+    serve.add_argument("csv", nargs="?", default="課題3.csv")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--workers", type=int, default=8)
+    serve.add_argument("--cache-size", type=int, default=256)
+
+    bench = sub.add_parser("bench", help="負荷をかけて requests/sec を測定する")
+    bench.add_argument("--url", default="http://127.0.0.1:8000/scoreboard")
+    bench.add_argument("-n", "--requests", type=int, default=1000)
+    bench.add_argument("-c", "--concurrency", type=int, default=8)
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        csv_path = Path(args.csv)
+        if not csv_path.is_absolute():
+            csv_path = Path(__file__).resolve().parent / csv_path
+        try:
+            service = ScoreService(csv_path, cache_size=args.cache_size)
+        except (OSError, ValueError) as e:
+            print(f"エラー: ファイル '{csv_path}' を読み込めません: {e}")
+            return
+        server = ThreadPoolHTTPServer((args.host, args.port), service, workers=args.workers)
+        print(f"serving {csv_path} on http://{args.host}:{args.port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\nサーバーを停止します。")
+        finally:
+            server.server_close()
+    else:
+        result = run_benchmark(args.url, args.requests, args.concurrency)
+        print(f"成功: {result['ok']} 件  失敗: {result['failed']} 件")
+        print(f"経過時間: {result['elapsed']:.2f} 秒")
+        print(f"requests/sec: {result['rps']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,50 @@
 """
 
 import csv
+import heapq
+import itertools
+import json
 import os
+import tempfile
+import uuid
 from collections import defaultdict
 
 
+def iter_scores_from_reader(reader):
+    """
+    csv.DictReader から (参加者名, スコア) を1件ずつ取り出すジェネレータ
+    
+    Args:
+        reader: ヘッダー付きの csv.DictReader
+    
+    Yields:
+        tuple: (参加者名, スコア)
+    """
+    headers = reader.fieldnames
+    
+    # 参加者名の列を特定（最初の列を参加者名と仮定）
+    name_column = headers[0]
+    
+    # スコア列を特定（数値列を探す）
+    score_columns = []
+    for header in headers[1:]:
+        score_columns.append(header)
+    
+    # データを読み込む
+    for row in reader:
+        player_name = row[name_column].strip()
+        if not player_name:
+            continue
+        
+        # 各スコアを取得
+        for column in score_columns:
+            try:
+                yield player_name, float(row[column].strip())
+            except (ValueError, KeyError):
+                # スコアが無効な場合はスキップ
+                continue
+
+
 def load_scores_from_csv(filename):
     """
     CSVファイルからスコアデータを読み込む関数
@@ -32,28 +72,8 @@ def load_scores_from_csv(filename):
                 print("エラー: CSVファイルにヘッダーが見つかりません。")
                 return {}
             
-            # 参加者名の列を特定（最初の列を参加者名と仮定）
-            name_column = headers[0]
-            
-            # スコア列を特定（数値列を探す）
-            score_columns = []
-            for header in headers[1:]:
-                score_columns.append(header)
-            
-            # データを読み込む
-            for row in reader:
-                player_name = row[name_column].strip()
-                if not player_name:
-                    continue
-                
-                # 各スコアを取得
-                for column in score_columns:
-                    try:
-                        score = float(row[column].strip())
-                        scores[player_name].append(score)
-                    except (ValueError, KeyError):
-                        # スコアが無効な場合はスキップ
-                        continue
+            for player_name, score in iter_scores_from_reader(reader):
+                scores[player_name].append(score)
     
     except FileNotFoundError:
         print(f"エラー: ファイル '{filename}' が見つかりません。")
@@ -87,37 +107,92 @@ def calculate_statistics(scores_list):
     }
 
 
-def display_scoreboard(scores):
+def iter_statistics(scores):
     """
-    5教科スコア表を表示する関数
-    各参加者の5教科の平均点、最高点、最低点を表形式で表示します。
+    参加者名順に統計情報を取り出すジェネレータ
     
     Args:
         scores: {参加者名: [スコアのリスト]} の形式の辞書
+    
+    Yields:
+        tuple: (参加者名, 統計情報)
     """
-    if not scores:
-        print("\n" + "=" * 50)
-        print("5教科スコア表")
-        print("=" * 50)
-        print("スコアデータがありません。")
-        print("=" * 50)
-        return
+    for player_name, scores_list in sorted(scores.items()):
+        stats = calculate_statistics(scores_list)
+        if stats:
+            yield player_name, stats
+
+
+def print_empty_scoreboard():
+    """スコアデータがない場合の表を表示する関数"""
+    print("\n" + "=" * 50)
+    print("5教科スコア表")
+    print("=" * 50)
+    print("スコアデータがありません。")
+    print("=" * 50)
+
+
+def print_scoreboard_rows(statistics):
+    """
+    統計情報を表形式で表示する関数
     
+    Args:
+        statistics: (参加者名, 統計情報) を参加者名順に返すイテラブル
+    """
     print("\n" + "=" * 100)
     print("5教科スコア表".center(100))
     print("=" * 100)
     print(f"{'参加者名':<20} {'平均点':<20} {'最低点':<20} {'最高点':<20} {'科目数':<15}")
     print("-" * 100)
     
-    # 各参加者のスコアを計算して表示
-    for player_name, scores_list in sorted(scores.items()):
-        stats = calculate_statistics(scores_list)
-        if stats:
-            print(f"{player_name:<20} {stats['average']:<20.2f} {stats['min']:<20.2f} {stats['max']:<20.2f} {stats['count']:<15}")
+    # 各参加者のスコアを表示
+    for player_name, stats in statistics:
+        print(f"{player_name:<20} {stats['average']:<20.2f} {stats['min']:<20.2f} {stats['max']:<20.2f} {stats['count']:<15}")
     
     print("=" * 100)
 
 
+def write_scoreboard_rows(statistics, output_filename):
+    """
+    統計情報をCSVファイルに書き込む関数
+    
+    Args:
+        statistics: (参加者名, 統計情報) を参加者名順に返すイテラブル
+        output_filename: 保存するファイル名
+    """
+    with open(output_filename, 'w', newline='', encoding='utf-8-sig') as csvfile:
+        fieldnames = ['参加者名', '平均点', '最低点', '最高点', 'スコア数', '合計点']
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        
+        writer.writeheader()
+        
+        # 各参加者のスコアを書き込む
+        for player_name, stats in statistics:
+            writer.writerow({
+                '参加者名': player_name,
+                '平均点': f"{stats['average']:.2f}",
+                '最低点': f"{stats['min']:.2f}",
+                '最高点': f"{stats['max']:.2f}",
+                'スコア数': stats['count'],
+                '合計点': f"{stats['total']:.2f}"
+            })
+
+
+def display_scoreboard(scores):
+    """
+    5教科スコア表を表示する関数
+    各参加者の5教科の平均点、最高点、最低点を表形式で表示します。
+    
+    Args:
+        scores: {参加者名: [スコアのリスト]} の形式の辞書
+    """
+    if not scores:
+        print_empty_scoreboard()
+        return
+    
+    print_scoreboard_rows(iter_statistics(scores))
+
+
 def save_scoreboard_to_csv(scores, output_filename):
     """
     スコア表をCSVファイルに保存する関数
@@ -131,24 +206,285 @@ def save_scoreboard_to_csv(scores, output_filename):
         return False
     
     try:
-        with open(output_filename, 'w', newline='', encoding='utf-8-sig') as csvfile:
-            fieldnames = ['参加者名', '平均点', '最低点', '最高点', 'スコア数', '合計点']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            
-            # 各参加者のスコアを書き込む
-            for player_name, scores_list in sorted(scores.items()):
-                stats = calculate_statistics(scores_list)
-                if stats:
-                    writer.writerow({
-                        '参加者名': player_name,
-                        '平均点': f"{stats['average']:.2f}",
-                        '最低点': f"{stats['min']:.2f}",
-                        '最高点': f"{stats['max']:.2f}",
-                        'スコア数': stats['count'],
-                        '合計点': f"{stats['total']:.2f}"
-                    })
+        write_scoreboard_rows(iter_statistics(scores), output_filename)
+        
+        print(f"\nスコア表を '{output_filename}' に保存しました。")
+        return True
+        
+    except Exception as e:
+        print(f"\nファイルの保存中にエラーが発生しました: {e}")
+        return False
+
+
+# ---------------------------------------------------------------------------
+# 省メモリ（外部メモリ）モード
+# 参加者数が多くメモリに収まらないCSVのために、行を参加者ごとに一時ファイルへ
+# ハッシュ分割し、分割ごとに集計・整列してから k-way マージで出力します。
+# ---------------------------------------------------------------------------
+
+# 使用メモリの上限（バイト）の既定値
+DEFAULT_MEMORY_LIMIT = 64 * 1024 * 1024
+
+# 入力CSVの読み込み・結果CSVの書き出しなど、参加者数によらず必要なメモリの見積もり
+RESERVED_MEMORY = 256 * 1024
+
+# 指定できる使用メモリの上限の最小値
+MIN_MEMORY_LIMIT = 2 * RESERVED_MEMORY
+
+# 分割ファイル1バイトあたり、集計時に必要になるメモリの見積もり倍率
+# （参加者ごとに辞書エントリと数値4つを持つため、ファイルの数十倍を見込む）
+MEMORY_PER_INPUT_BYTE = 24
+
+# 入力CSVを分割ファイル（1スコア1行のJSON）にしたときの大きさの見積もり倍率
+# （スコア列が複数あると参加者名が行ごとに繰り返されるため、CSVより大きくなる）
+PARTITION_EXPANSION = 4
+
+# 一時ファイルはバッファなしで開き、書き込みは自前のバッファにまとめてから行う
+OPEN_FILE_COST = 1024
+WRITE_CHUNK_SIZE = 16 * 1024
+
+# マージ時にランファイル1つを読むための読み込みバッファと、その1つあたりのメモリの見積もり
+READ_BUFFER_SIZE = 4 * 1024
+RUN_READER_COST = 3 * READ_BUFFER_SIZE
+
+# 同時に開く一時ファイル数の上限（OSのファイル数制限に対する余裕）
+MAX_OPEN_FILES = 256
+
+# 再分割の最大深さ（同じ参加者の行しかない分割はそれ以上分けられないため）
+MAX_PARTITION_DEPTH = 4
+
+
+_json_encode = json.JSONEncoder(ensure_ascii=False).encode
+_json_decode = json.JSONDecoder().decode
+
+
+def _encode_line(values):
+    """一時ファイルの1行（JSON）をバイト列にする。"""
+    return (_json_encode(values) + "\n").encode('utf-8')
+
+
+def _read_lines(path):
+    """一時ファイルから1行ずつ値を読み出すジェネレータ"""
+    with open(path, 'rb', buffering=READ_BUFFER_SIZE) as f:
+        for line in f:
+            yield _json_decode(line.decode('utf-8'))
+
+
+def _write_lines(path, lines):
+    """バイト列の行を WRITE_CHUNK_SIZE ずつまとめて一時ファイルに書き込む。"""
+    with open(path, 'wb', buffering=0) as f:
+        buf = bytearray()
+        for line in lines:
+            buf += line
+            if len(buf) >= WRITE_CHUNK_SIZE:
+                f.write(buf)
+                del buf[:]
+        f.write(buf)
+
+
+def _fits_in_memory(size, work_memory):
+    """size バイトの入力を作業用メモリ内で集計できるかを見積もる。"""
+    return size * MEMORY_PER_INPUT_BYTE <= work_memory
+
+
+def _partition_count(size, work_memory):
+    """
+    分割ファイルが作業用メモリ内で集計できるように分割数を決める。
+    ハッシュの偏りで分割ファイルが上限を少し超えて再分割にならないよう、2倍に分ける。
+    """
+    needed = -(-size * MEMORY_PER_INPUT_BYTE // work_memory)
+    files = work_memory // 4 // OPEN_FILE_COST
+    return max(2, min(2 * needed, files, MAX_OPEN_FILES))
+
+
+def _partition_rows(rows, tmp_dir, count, depth, work_memory):
+    """
+    (参加者名, スコア) を参加者名のハッシュで count 個の一時ファイルに振り分ける関数
+    書き込み待ちの行は合計が作業用メモリの半分を超えたらまとめて書き出します。
+    
+    Returns:
+        list: 一時ファイルのパスのリスト
+    """
+    buffer_limit = work_memory // 2
+    paths = [os.path.join(tmp_dir, f"part_{depth}_{uuid.uuid4().hex}") for _ in range(count)]
+    files = [open(path, 'wb', buffering=0) for path in paths]
+    buffers = [bytearray() for _ in range(count)]
+    
+    def flush():
+        for f, buf in zip(files, buffers):
+            if buf:
+                f.write(buf)
+                del buf[:]
+    
+    try:
+        buffered = 0
+        for player_name, score in rows:
+            line = _encode_line([player_name, score])
+            buffers[hash((depth, player_name)) % count] += line
+            buffered += len(line)
+            if buffered > buffer_limit:
+                flush()
+                buffered = 0
+        flush()
+    finally:
+        for f in files:
+            f.close()
+    return paths
+
+
+def _aggregate_rows(rows):
+    """
+    (参加者名, スコア) を参加者ごとに集計する関数
+    
+    Returns:
+        dict: {参加者名: [スコア数, 合計点, 最低点, 最高点]}
+    """
+    totals = {}
+    for player_name, score in rows:
+        agg = totals.get(player_name)
+        if agg is None:
+            totals[player_name] = [1, score, score, score]
+        else:
+            agg[0] += 1
+            agg[1] += score
+            if score < agg[2]:
+                agg[2] = score
+            if score > agg[3]:
+                agg[3] = score
+    return totals
+
+
+def _aggregate_partition(path, tmp_dir):
+    """
+    分割ファイルを参加者ごとに集計し、参加者名順の集計ファイル（ラン）を書き出す関数
+    
+    Returns:
+        str: ランファイルのパス
+    """
+    totals = _aggregate_rows(_read_lines(path))
+    run_path = os.path.join(tmp_dir, f"run_{uuid.uuid4().hex}")
+    _write_lines(run_path, (_encode_line([name, *totals[name]]) for name in sorted(totals)))
+    return run_path
+
+
+def _build_runs(rows, tmp_dir, work_memory, size, depth=0):
+    """
+    行を分割して集計し、ランファイルのパスを返す関数
+    分割ファイルがまだ作業用メモリに収まらない場合は再分割します。
+    """
+    runs = []
+    count = _partition_count(size, work_memory)
+    for path in _partition_rows(rows, tmp_dir, count, depth, work_memory):
+        part_size = os.path.getsize(path)
+        if not _fits_in_memory(part_size, work_memory) and depth < MAX_PARTITION_DEPTH:
+            runs.extend(_build_runs(_read_lines(path), tmp_dir, work_memory, part_size, depth + 1))
+        elif part_size:
+            runs.append(_aggregate_partition(path, tmp_dir))
+        os.remove(path)
+    return runs
+
+
+def _merge_fan_in(work_memory):
+    """作業用メモリ内で同時に読めるランファイルの数を返す。"""
+    return max(2, min(work_memory // RUN_READER_COST, MAX_OPEN_FILES))
+
+
+def _merge_runs(runs, tmp_dir, fan_in):
+    """
+    ランの数が fan_in を超える場合に、fan_in 個ずつ中間マージする関数
+    
+    Returns:
+        list: fan_in 個以下になったランファイルのパスのリスト
+    """
+    while len(runs) > fan_in:
+        merged = []
+        for i in range(0, len(runs), fan_in):
+            group = runs[i:i + fan_in]
+            run_path = os.path.join(tmp_dir, f"run_{uuid.uuid4().hex}")
+            rows = heapq.merge(*map(_read_lines, group), key=lambda r: r[0])
+            _write_lines(run_path, map(_encode_line, rows))
+            for path in group:
+                os.remove(path)
+            merged.append(run_path)
+        runs = merged
+    return runs
+
+
+def iter_statistics_external(filename, tmp_dir, memory_limit=DEFAULT_MEMORY_LIMIT):
+    """
+    CSVファイルをメモリに全て載せずに、参加者名順に統計情報を取り出すジェネレータ
+    
+    Args:
+        filename: 読み込むCSVファイル名
+        tmp_dir: 一時ファイルを置くディレクトリ
+        memory_limit: 使用メモリの上限（バイト、MIN_MEMORY_LIMIT 以上）
+    
+    Yields:
+        tuple: (参加者名, 統計情報)
+    """
+    if memory_limit < MIN_MEMORY_LIMIT:
+        raise ValueError(f"使用メモリの上限は {MIN_MEMORY_LIMIT} バイト以上を指定してください。")
+    work_memory = memory_limit - RESERVED_MEMORY
+    
+    size = os.path.getsize(filename)
+    with open(filename, 'r', encoding='utf-8-sig') as csvfile:
+        reader = csv.DictReader(csvfile)
+        if not reader.fieldnames:
+            print("エラー: CSVファイルにヘッダーが見つかりません。")
+            return
+        
+        # 上限内に収まる入力は一時ファイルを使わずにそのまま集計する
+        if _fits_in_memory(size, work_memory):
+            totals = _aggregate_rows(iter_scores_from_reader(reader))
+            for player_name in sorted(totals):
+                count, total, low, high = totals.pop(player_name)
+                yield player_name, {
+                    'average': total / count,
+                    'min': low,
+                    'max': high,
+                    'count': count,
+                    'total': total
+                }
+            return
+        
+        runs = _build_runs(iter_scores_from_reader(reader), tmp_dir, work_memory,
+                           size * PARTITION_EXPANSION)
+    
+    # 各参加者はいずれか1つのランにしか現れないので、マージ結果をそのまま出力できる
+    fan_in = _merge_fan_in(work_memory)
+    runs = _merge_runs(runs, tmp_dir, fan_in)
+    for player_name, count, total, low, high in heapq.merge(*map(_read_lines, runs), key=lambda r: r[0]):
+        yield player_name, {
+            'average': total / count,
+            'min': low,
+            'max': high,
+            'count': count,
+            'total': total
+        }
+
+
+def save_scoreboard_to_csv_external(input_filename, output_filename, memory_limit=DEFAULT_MEMORY_LIMIT):
+    """
+    省メモリモードでスコア表をCSVファイルに保存する関数
+    
+    Args:
+        input_filename: 読み込むCSVファイル名
+        output_filename: 保存するファイル名
+        memory_limit: 使用メモリの上限（バイト）
+    """
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            statistics = iter_statistics_external(input_filename, tmp_dir, memory_limit)
+            try:
+                first = next(statistics, None)
+            except FileNotFoundError:
+                # 最初の next() で入力ファイルを開く（出力ファイルはまだ開いていない）
+                print(f"エラー: ファイル '{input_filename}' が見つかりません。")
+                return False
+            if first is None:
+                print("\nスコアデータがありません。")
+                return False
+            write_scoreboard_rows(itertools.chain([first], statistics), output_filename)
         
         print(f"\nスコア表を '{output_filename}' に保存しました。")
         return True
@@ -169,13 +505,14 @@ def main():
         print("\nメニュー:")
         print("1. CSVファイルからスコア表を表示")
         print("2. CSVファイルからスコア表を作成して保存")
-        print("3. 終了")
+        print("3. 大きなCSVファイルからスコア表を作成して保存（省メモリ）")
+        print("4. 終了")
         
         try:
-            choice = input("\n選択してください (1-3): ").strip()
+            choice = input("\n選択してください (1-4): ").strip()
             
             # デバッグ用（入力値を確認）
-            if choice and choice not in ["1", "2", "3"]:
+            if choice and choice not in ["1", "2", "3", "4"]:
                 print(f"入力された値: '{choice}' (長さ: {len(choice)})")
             
             if choice == "1":
@@ -206,11 +543,34 @@ def main():
                     save_scoreboard_to_csv(scores, output_filename)
                 
             elif choice == "3":
+                input_filename = input("\n読み込むCSVファイル名を入力してください: ").strip()
+                if not input_filename:
+                    print("ファイル名を入力してください。")
+                    continue
+                
+                output_filename = input("保存するCSVファイル名を入力してください（Enterで自動生成）: ").strip()
+                if not output_filename:
+                    output_filename = "scoreboard_result.csv"
+                elif not output_filename.endswith('.csv'):
+                    output_filename += '.csv'
+                
+                memory_limit_mb = input("使用メモリの上限をMB単位で入力してください（Enterで64MB）: ").strip()
+                if memory_limit_mb:
+                    if not memory_limit_mb.isdigit() or int(memory_limit_mb) <= 0:
+                        print("使用メモリの上限は1以上の整数で入力してください。")
+                        continue
+                    memory_limit = int(memory_limit_mb) * 1024 * 1024
+                else:
+                    memory_limit = DEFAULT_MEMORY_LIMIT
+                
+                save_scoreboard_to_csv_external(input_filename, output_filename, memory_limit)
+                
+            elif choice == "4":
                 print("\nプログラムを終了します。")
                 break
                 
             else:
-                print("1から3の数字を入力してください。")
+                print("1から4の数字を入力してください。")
                 
         except KeyboardInterrupt:
             print("\n\nプログラムを終了します。")
@@ -0,0 +1,73 @@
+"""leaderboard.py のランキング索引のテスト"""
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from leaderboard import LeaderboardIndex  # noqa: E402
+
+
+class LeaderboardIndexTest(unittest.TestCase):
+
+    def test_re_recording_updates_average_and_rank(self):
+        board = LeaderboardIndex()
+        board.record("A", 5)
+        board.record("B", 7)
+        self.assertEqual(board.rank("A"), 1)
+
+        board.record("A", 15)  # A の平均は 10 になる
+        self.assertEqual(len(board), 2)
+        self.assertEqual(board.top(2), [("B", 7.0), ("A", 10.0)])
+        self.assertEqual(board.rank("A"), 2)
+        self.assertEqual(board.rank("B"), 1)
+
+    def test_tied_averages_share_rank(self):
+        board = LeaderboardIndex()
+        board.record("A", 4)
+        board.record("B", 6)
+        board.record("B", 2)
+        board.record("C", 4)
+        board.record("D", 9)
+        self.assertEqual([board.rank(p) for p in "ABCD"], [1, 1, 1, 4])
+        self.assertEqual(board.top_percent("A"), 25.0)
+        self.assertEqual(board.top_percent("D"), 100.0)
+
+    def test_top_with_k_larger_than_size(self):
+        board = LeaderboardIndex()
+        self.assertEqual(board.top(3), [])
+        board.record("A", 3)
+        board.record("B", 1)
+        self.assertEqual(board.top(10), [("B", 1.0), ("A", 3.0)])
+        self.assertEqual(board.top(0), [])
+
+    def test_unknown_player(self):
+        board = LeaderboardIndex()
+        board.record("A", 3)
+        self.assertIsNone(board.rank("Z"))
+        self.assertIsNone(board.top_percent("Z"))
+        self.assertNotIn("Z", board)
+
+    def test_matches_full_sort(self):
+        rng = random.Random(0)
+        board = LeaderboardIndex()
+        attempts = {}
+        for _ in range(5000):
+            player = f"p{rng.randrange(800)}"
+            a = rng.randint(1, 12)
+            board.record(player, a)
+            attempts.setdefault(player, []).append(a)
+
+        averages = {p: sum(v) / len(v) for p, v in attempts.items()}
+        expected = sorted((avg, p) for p, avg in averages.items())
+        self.assertEqual(len(board), len(averages))
+        self.assertEqual(board.top(50), [(p, avg) for avg, p in expected[:50]])
+        for player, avg in averages.items():
+            expected_rank = 1 + sum(1 for other in averages.values() if other < avg)
+            self.assertEqual(board.rank(player), expected_rank)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+"""score_cube.py の集計キューブのテスト"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import score_cube  # noqa: E402
+from score_cube import ScoreCube  # noqa: E402
+
+
+class ScoreCubeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.csv_path = os.path.join(self.tmp.name, "scores.csv")
+
+    def _write(self, text, mode="w"):
+        with open(self.csv_path, mode, encoding="utf-8", newline="") as f:
+            f.write(text)
+        # 更新時刻の分解能に左右されないように書き込みごとに変える
+        stat = os.stat(self.csv_path)
+        os.utime(self.csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_append_only_reingest(self):
+        cube = ScoreCube()
+        self._write("名前,所属,スコア\n佐藤,営業,80\n鈴木,開発,92\n")
+        self.assertEqual(cube.add_csv(self.csv_path, "2025-12-12"), 2)
+        self.assertIsNone(cube.add_csv(self.csv_path, "2025-12-12"))
+
+        self._write("高橋,営業,70\n", mode="a")
+        self.assertEqual(cube.add_csv(self.csv_path, "2025-12-13"), 1)
+        self.assertEqual(cube.department_counts(), {"営業": 2, "開発": 1})
+        self.assertEqual(cube.rollup(("date",)), {
+            ("2025-12-12",): [172.0, 2, 80.0, 92.0],
+            ("2025-12-13",): [70.0, 1, 70.0, 70.0],
+        })
+
+    def test_trailing_row_without_newline_is_read_next_time(self):
+        cube = ScoreCube()
+        self._write("名前,所属,スコア\n佐藤,営業,80\n田中,営業,9")
+        self.assertEqual(cube.add_csv(self.csv_path, "d"), 1)
+
+        self._write("5\n", mode="a")
+        self.assertEqual(cube.add_csv(self.csv_path, "d"), 1)
+        self.assertEqual(cube.cells, {
+            ("営業", 80, "d"): [80.0, 1, 80.0, 80.0],
+            ("営業", 90, "d"): [95.0, 1, 95.0, 95.0],
+        })
+
+    def test_rows_appended_during_ingest_are_counted_once(self):
+        cube = ScoreCube()
+        self._write("名前,所属,スコア\n佐藤,営業,80\n")
+        snapshot = os.stat(self.csv_path)
+        self._write("鈴木,営業,90\n", mode="a")
+
+        # stat した後に追記された行は、今回は読まない
+        with mock.patch.object(score_cube.os, "stat", return_value=snapshot):
+            self.assertEqual(cube.add_csv(self.csv_path, "d"), 1)
+        self.assertEqual(cube.add_csv(self.csv_path, "d"), 1)
+        self.assertEqual(cube.department_counts(), {"営業": 2})
+
+    def test_edited_prefix_raises(self):
+        cube = ScoreCube()
+        self._write("名前,所属,スコア\n佐藤,営業,91\n")
+        cube.add_csv(self.csv_path, "d")
+
+        self._write("名前,所属,スコア\n佐藤,営業,10\n高橋,営業,70\n")
+        with self.assertRaises(ValueError):
+            cube.add_csv(self.csv_path, "d")
+        self.assertEqual(cube.department_counts(), {"営業": 1})
+
+    def test_shrunk_file_raises(self):
+        cube = ScoreCube()
+        self._write("名前,所属,スコア\n佐藤,営業,91\n鈴木,開発,92\n")
+        cube.add_csv(self.csv_path, "d")
+
+        self._write("名前,所属,スコア\n")
+        with self.assertRaises(ValueError):
+            cube.add_csv(self.csv_path, "d")
+
+    def test_invalid_and_non_finite_scores_are_skipped(self):
+        cube = ScoreCube()
+        self._write("名前,所属,スコア\nA,営業,x\nB,営業,nan\nC,営業,inf\nD,営業\nE,営業,89.5\n")
+        self.assertEqual(cube.add_csv(self.csv_path, "d"), 1)
+        # 89.5 は 89〜80点 の区分に入る
+        self.assertEqual(cube.histogram_counts(), (["90点以上", "89〜80点", "79〜70点"], [0, 1, 0]))
+
+    def test_rollup_filters(self):
+        cube = ScoreCube()
+        cube.add("営業", 95, "2025-12-12")
+        cube.add("営業", 72, "2025-12-12")
+        cube.add("営業", 85, "2025-12-13")
+        cube.add("開発", 91, "2025-12-13")
+
+        self.assertEqual(cube.rollup(("bin",), dept="営業"), {
+            (90,): [95, 1, 95, 95],
+            (70,): [72, 1, 72, 72],
+            (80,): [85, 1, 85, 85],
+        })
+        self.assertEqual(cube.rollup(("dept",), date="2025-12-13"), {
+            ("営業",): [85, 1, 85, 85],
+            ("開発",): [91, 1, 91, 91],
+        })
+        self.assertEqual(cube.rollup((), dept="営業", date="2025-12-12"), {(): [167, 2, 72, 95]})
+        self.assertEqual(cube.rollup(("dept",), dept="人事"), {})
+
+        departments, averages, max_scores, min_scores = cube.department_summary()
+        self.assertEqual(departments, ["営業", "開発"])
+        self.assertAlmostEqual(averages[0], 84.0)
+        self.assertEqual((max_scores, min_scores), ([95, 91], [72, 91]))
+
+    def test_save_load_round_trip(self):
+        cube = ScoreCube()
+        self._write("名前,所属,スコア\n佐藤,営業,80\n鈴木,開発,92\n")
+        cube.add_csv(self.csv_path, "d")
+        cube_path = os.path.join(self.tmp.name, "cube.json")
+        cube.save(cube_path)
+
+        loaded = ScoreCube.load(cube_path)
+        self.assertEqual(loaded.cells, cube.cells)
+        self.assertEqual(loaded.files, cube.files)
+        # 読み込み直したキューブでも取り込み済みとして扱われる
+        self.assertIsNone(loaded.add_csv(self.csv_path, "d"))
+
+    def test_load_missing_file(self):
+        missing = os.path.join(self.tmp.name, "typo.json")
+        with self.assertRaises(FileNotFoundError):
+            ScoreCube.load(missing)
+        self.assertEqual(ScoreCube.load(missing, missing_ok=True).cells, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+"""score_server.py のテスト（localhost で ThreadPoolHTTPServer を起動する）"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import score_server  # noqa: E402
+
+
+class ScoreServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.csv_path = os.path.join(self.tmp.name, "scores.csv")
+        with open(self.csv_path, "w", encoding="utf-8") as f:
+            f.write("名前,所属,スコア\n佐藤,営業,80\n鈴木,開発,92\n高橋,営業,89.5\n")
+
+        service = score_server.ScoreService(self.csv_path, cache_size=16)
+        self.server = score_server.ThreadPoolHTTPServer(("127.0.0.1", 0), service, workers=4)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def _get(self, path):
+        with urllib.request.urlopen(self.base_url + path) as res:
+            return res.status, json.loads(res.read())
+
+    def _get_error_status(self, path):
+        with self.assertRaises(urllib.error.HTTPError) as cm:
+            urllib.request.urlopen(self.base_url + path)
+        cm.exception.close()
+        return cm.exception.code
+
+    def test_departments_and_histogram(self):
+        status, data = self._get("/departments")
+        self.assertEqual(status, 200)
+        self.assertEqual([d["dept"] for d in data], ["営業", "開発"])
+        self.assertEqual(data[0]["count"], 2)
+
+        _, data = self._get("/departments?dept=" + urllib.parse.quote("開発"))
+        self.assertEqual([(d["dept"], d["average"]) for d in data], [("開発", 92.0)])
+
+        _, data = self._get("/histogram")
+        self.assertEqual(data["counts"], [1, 2, 0])
+
+    def test_reloads_and_invalidates_cache_when_csv_changes(self):
+        _, before = self._get("/departments")
+        self.assertEqual(before[0]["count"], 2)
+
+        with open(self.csv_path, "a", encoding="utf-8") as f:
+            f.write("田中,営業,70\n")
+        # 更新時刻の分解能に左右されないように確実に変える
+        stat = os.stat(self.csv_path)
+        os.utime(self.csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        _, after = self._get("/departments")
+        self.assertEqual(after[0]["count"], 3)
+        self.assertEqual(after[0]["min"], 70.0)
+
+    def test_keeps_last_index_when_csv_is_missing(self):
+        os.remove(self.csv_path)
+        status, data = self._get("/departments")
+        self.assertEqual(status, 200)
+        self.assertEqual(len(data), 2)
+
+    def test_error_statuses(self):
+        self.assertEqual(self._get_error_status("/nope"), 404)
+        self.assertEqual(self._get_error_status("/departments?format=xml"), 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""scoreboard.py の省メモリ（外部メモリ）モードのテスト"""
+
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import scoreboard  # noqa: E402
+
+
+class ExternalScoreboardTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.input_path = os.path.join(self.tmp.name, "scores.csv")
+        rng = random.Random(0)
+        with open(self.input_path, "w", encoding="utf-8") as f:
+            f.write("名前,国語,数学,英語\n")
+            for i in range(30000):
+                player = f"参加者{rng.randrange(20000)}"
+                f.write(f"{player},{rng.randint(0, 100)},{rng.randint(0, 100)},{rng.randint(0, 100)}\n")
+
+    def _read(self, path):
+        with open(path, encoding="utf-8-sig") as f:
+            return f.read()
+
+    def test_matches_in_memory_output_within_memory_limit(self):
+        expected_path = os.path.join(self.tmp.name, "expected.csv")
+        actual_path = os.path.join(self.tmp.name, "actual.csv")
+        scoreboard.save_scoreboard_to_csv(scoreboard.load_scores_from_csv(self.input_path), expected_path)
+
+        memory_limit = scoreboard.MIN_MEMORY_LIMIT
+        tracemalloc.start()
+        try:
+            saved = scoreboard.save_scoreboard_to_csv_external(self.input_path, actual_path, memory_limit)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertTrue(saved)
+        self.assertLessEqual(peak, memory_limit)
+        self.assertEqual(self._read(expected_path), self._read(actual_path))
+
+    def test_small_input_is_aggregated_without_partitioning(self):
+        expected_path = os.path.join(self.tmp.name, "expected.csv")
+        actual_path = os.path.join(self.tmp.name, "actual.csv")
+        scoreboard.save_scoreboard_to_csv(scoreboard.load_scores_from_csv(self.input_path), expected_path)
+
+        original = scoreboard._partition_rows
+        calls = []
+
+        def counting_partition_rows(*args, **kwargs):
+            calls.append(args)
+            return original(*args, **kwargs)
+
+        scoreboard._partition_rows = counting_partition_rows
+        self.addCleanup(setattr, scoreboard, "_partition_rows", original)
+        self.assertTrue(scoreboard.save_scoreboard_to_csv_external(self.input_path, actual_path))
+        self.assertEqual(calls, [])
+        self.assertEqual(self._read(expected_path), self._read(actual_path))
+
+    def test_output_error_is_not_reported_as_missing_input(self):
+        output_path = os.path.join(self.tmp.name, "no_such_dir", "out.csv")
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            saved = scoreboard.save_scoreboard_to_csv_external(self.input_path, output_path)
+        self.assertFalse(saved)
+        self.assertIn("ファイルの保存中にエラーが発生しました", out.getvalue())
+        self.assertNotIn(self.input_path, out.getvalue())
+
+    def test_missing_input_is_reported(self):
+        missing_path = os.path.join(self.tmp.name, "missing.csv")
+        output_path = os.path.join(self.tmp.name, "out.csv")
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            saved = scoreboard.save_scoreboard_to_csv_external(missing_path, output_path)
+        self.assertFalse(saved)
+        self.assertIn(f"エラー: ファイル '{missing_path}' が見つかりません。", out.getvalue())
+
+    def test_rejects_memory_limit_below_minimum(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            statistics = scoreboard.iter_statistics_external(self.input_path, tmp_dir, 0)
+            with self.assertRaises(ValueError):
+                next(statistics)
+
+
+if __name__ == "__main__":
+    unittest.main()